@@ -1,10 +1,14 @@
 from flask import Flask, render_template, request, redirect, url_for
 from werkzeug.utils import secure_filename
 import os
+import uuid
+import logging
+import threading
 from printer import printer_utils as print_utils
 from pathlib import Path
 import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from flask import jsonify
 
 
@@ -13,18 +17,54 @@ CONFIG_PATH = Path("config.json")
 
 app = Flask(__name__)
 app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+logger = logging.getLogger(__name__)
 
-with open(CONFIG_PATH) as f:
-    config = json.load(f)
+# config.json is edited by hand while the service runs: reads are cached on
+# its mtime, and settings writes re-read the file under _config_lock.
+_CFG_CACHE: tuple[int, dict] | None = None  # (config.json st_mtime_ns, parsed config)
+_config_lock = threading.Lock()
 
-def _read_cfg():
+# Printing blocks on the device; run jobs off the request thread.
+# A single worker keeps receipts in submission order.
+_print_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="print")
+
+def _report_print_error(fut):
+    exc = fut.exception()
+    if exc is not None:
+        logger.error("print job failed: %s", exc)
+
+def _dispatch_print(fn, *args):
+    _print_pool.submit(fn, *args).add_done_callback(_report_print_error)
+
+def _load_cfg_file() -> dict:
     with open(CONFIG_PATH) as f:
         return json.load(f)
 
+def _read_cfg() -> dict:
+    """Parsed config.json; only re-read when its mtime changes. Don't mutate the result."""
+    global _CFG_CACHE
+    mtime = os.stat(CONFIG_PATH).st_mtime_ns
+    if _CFG_CACHE is None or _CFG_CACHE[0] != mtime:
+        _CFG_CACHE = (mtime, _load_cfg_file())
+    return _CFG_CACHE[1]
+
+_read_cfg()  # fail at startup, as before, if config.json is missing or invalid
+
+def _print_upload(path):
+    # print_image has decoded the file by the time it returns; don't keep
+    # every phone photo on the SD card
+    try:
+        print_utils.print_image(path)
+    finally:
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning("could not remove upload %s: %s", path, e)
+
 def _write_cfg(data):
     tmp = CONFIG_PATH.with_suffix(".tmp")
     with open(tmp, "w") as f:
-        json.dump(data, f, indent=2)
+        f.write(json.dumps(data, indent=2))  # one Python-level write call instead of json.dump's many
     os.replace(tmp, CONFIG_PATH)
 
 @app.get("/settings/quote")
@@ -36,9 +76,10 @@ def get_quote_setting():
 def set_quote_setting():
     body = request.get_json(force=True) or {}
     val = bool(body.get("quote_footer_enabled", False))
-    cfg = _read_cfg()
-    cfg["quote_footer_enabled"] = val
-    _write_cfg(cfg)
+    with _config_lock:
+        cfg = _load_cfg_file()  # straight from disk: keep edits made since the last read
+        cfg["quote_footer_enabled"] = val
+        _write_cfg(cfg)
     return jsonify({"ok": True, "quote_footer_enabled": val})    
 
 
@@ -53,49 +94,49 @@ def submit():
     form_type = request.form.get("formType")
     include_quote = request.form.get("include_quote") == "on"
 
-    print(">>> Form submitted!")
-    print("Form type:", form_type)
-    print("Include quote:", include_quote)
-    print("Full form data:", request.form)
+    logger.debug("Form submitted: type=%s include_quote=%s data=%s",
+                 form_type, include_quote, request.form)
 
     # Get footer text from config if present and non-empty
-    footer_text = config.get("footer", "").strip()
+    footer_text = _read_cfg().get("footer", "").strip()
     if not footer_text:
         footer_text = None
 
     if form_type == "note":
         note = request.form.get("note_text", "").strip()
-        print("Note content:", note)
+        logger.debug("Note content: %s", note)
         if note:
-            print_utils.print_note(note, include_quote, footer_text)
+            _dispatch_print(print_utils.print_note, note, include_quote, footer_text)
 
     elif form_type == "todo":
         todo = request.form.get("todo_text", "").strip()
-        print("Todo content:", todo)
+        logger.debug("Todo content: %s", todo)
         if todo:
-            print_utils.print_todo(todo, include_quote, footer_text)
+            _dispatch_print(print_utils.print_todo, todo, include_quote, footer_text)
 
     elif form_type == "achievement":
         ach = request.form.get("achievement_text", "").strip()
         if ach:
-            print_utils.print_achievement(ach, include_quote, footer_text)
+            _dispatch_print(print_utils.print_achievement, ach, include_quote, footer_text)
 
     elif form_type == "photo":
         photo = request.files.get("photo_file")
         if photo and photo.filename:
-            filename = secure_filename(photo.filename)
+            # unique name: the job runs later, and phones name every photo "image.jpg"
+            filename = f"{uuid.uuid4().hex}_{secure_filename(photo.filename)}"
             filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
             photo.save(filepath)
-            print_utils.print_image(filepath)
+            _dispatch_print(_print_upload, filepath)
 
     return redirect(url_for("index", success="true"))
 
 
 @app.route("/trigger/weather")
 def trigger_weather():
-    print_utils.print_weather_report()
-    return "Weather printed!"
+    _dispatch_print(print_utils.print_weather_report)
+    return "Weather queued"
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     app.run(host="0.0.0.0", port=5000)
@@ -2,9 +2,16 @@
 from __future__ import annotations
 
 from pathlib import Path
-import os, json, time, unicodedata, re, random
+import os, sys, json, time, unicodedata, re, random, errno, atexit, threading, queue, csv
+from concurrent.futures import Future
+from functools import lru_cache
+from itertools import groupby
 from typing import Iterable
 import requests  # <-- for OpenWeatherMap
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # text/weather-only installs can run without Pillow
+    Image = ImageOps = None
 
 # ---------- Paths / Config ----------
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -29,15 +36,38 @@ DEFAULTS = {
     "weather_units": "imperial"
 }
 
+_CFG_TYPES = {
+    "cols": int, "printer_width_px": int, "max_image_height_px": int, "raster_chunk_rows": int,
+    "test_mode": bool, "quote_footer_enabled": bool,
+}
+
+_CFG_CACHE: tuple[int, dict] | None = None  # (config.json st_mtime_ns, merged config)
+
 def load_config() -> dict:
+    """Merged config; config.json is only re-parsed when its mtime changes."""
+    global _CFG_CACHE
+    try:
+        mtime = os.stat(CONFIG_PATH).st_mtime_ns
+    except OSError:
+        mtime = 0
+    if _CFG_CACHE and _CFG_CACHE[0] == mtime:
+        return _CFG_CACHE[1]
     try:
         with open(CONFIG_PATH) as f:
             data = json.load(f)
     except Exception:
         data = {}
     merged = {**DEFAULTS, **data}
-    if os.getenv("PRINTER_DEVICE"):
-        merged["printer_device"] = os.getenv("PRINTER_DEVICE")
+    env_dev = os.getenv("PRINTER_DEVICE")
+    if env_dev:
+        merged["printer_device"] = env_dev
+    # coerce once here so print paths can index the dict directly
+    for key, cast in _CFG_TYPES.items():
+        try:
+            merged[key] = cast(merged[key])
+        except (TypeError, ValueError):
+            merged[key] = DEFAULTS[key]
+    _CFG_CACHE = (mtime, merged)
     return merged
 
 # ---------- ESC/POS Primitives ----------
@@ -50,16 +80,27 @@ BOLD_ON      = ESC + b"\x45\x01"
 BOLD_OFF     = ESC + b"\x45\x00"
 CUT_PARTIAL  = GS  + b"\x56\x41\x00"  # GS V A 0 (partial cut)
 
+@lru_cache(maxsize=64)  # 8x8 valid sizes; returns the same immutable bytes each time
 def char_size(w: int = 1, h: int = 1) -> bytes:
     """GS ! n   (w,h in 1..8)"""
     w = max(1, min(8, w)) - 1
     h = max(1, min(8, h)) - 1
     return GS + b"\x21" + bytes([(w << 4) | h])
 
+def feed_lines(n: int = 1) -> bytes:
+    """ESC d n  (print and feed n lines, 0..255)"""
+    return ESC + b"d" + bytes([max(0, min(255, n))])
+
 def set_codepage_cp437() -> bytes:
     """ESC t 0  (CP437 on most models)"""
     return ESC + b"\x74\x00"
 
+# Prologue shared by every centered block: reset, CP437, center
+CENTER_INIT = INIT + set_codepage_cp437() + ALIGN_CENTER
+SIZE_NORMAL = char_size(1, 1)
+SIZE_DOUBLE = char_size(2, 2)
+FINALIZE    = b"\n\n" + CUT_PARTIAL  # feed past the tear bar, then cut
+
 # ---------- Text helpers ----------
 SMART_MAP = {
     "“": '"', "”": '"', "„": '"', "‟": '"',
@@ -68,21 +109,94 @@ SMART_MAP = {
     "\u00A0": " ",
 }
 
+# SMART_MAP folds plus "?" for control chars (except \n and \t) and DEL
+_SANITIZE_TABLE = str.maketrans({
+    **SMART_MAP,
+    **{chr(c): "?" for c in range(32) if chr(c) not in "\n\t"},
+    "\x7f": "?",
+})
+_TOKEN_RE = re.compile(r"\S+|\s+")
+
+def _fold_text(s: str) -> str:
+    """SMART_MAP/control-char fold; NFKC only when the fold alone leaves non-ASCII."""
+    t = s.translate(_SANITIZE_TABLE)
+    if t.isascii():  # ASCII plus smart punctuation: NFKC would change nothing
+        return t
+    return unicodedata.normalize("NFKC", s).translate(_SANITIZE_TABLE)
+
 def sanitize_text(s: str) -> str:
-    s = unicodedata.normalize("NFKC", s)
-    for k, v in SMART_MAP.items():
-        s = s.replace(k, v)
-    # filter non-printables except \n and \t
-    return "".join(ch if (32 <= ord(ch) <= 126) or ch in "\n\t" else "?" for ch in s)
-
-def wrap_text(text: str, cols: int) -> list[str]:
-    """Word-wrap without breaking words. Preserves paragraph breaks."""
+    s = _fold_text(s)
+    # anything still outside printable ASCII becomes "?"
+    return s if s.isascii() else s.encode("ascii", "replace").decode("ascii")
+
+def wrap_text(text: str, cols: int, optimal: bool = False) -> list[str]:
+    """
+    Word-wrap without breaking words. Preserves paragraph breaks.
+    optimal=True balances line lengths (minimum raggedness) instead of
+    filling each line greedily, avoiding lone short words on narrow paper.
+    """
+    return list(_wrap_cached(text, cols, optimal))
+
+def _balanced_lines(para: str, cols: int) -> list[str]:
+    """
+    Knuth-Plass style breaks for one paragraph: minimize the sum of squared
+    trailing space over all lines, the last included, so a paragraph never
+    ends on a lone orphan word. O(words x words-per-line).
+    """
+    words: list[str] = []
+    gaps: list[str] = []  # whitespace run before each word
+    gap = ""
+    for m in _TOKEN_RE.finditer(para):
+        w = m.group()
+        if w.isspace():
+            gap = w
+        else:
+            words.append(w); gaps.append(gap); gap = ""
+    n = len(words)
+    if not n:
+        return [""] if para else []
+
+    inf = float("inf")
+    cost = [0.0] + [inf] * n  # cost[j]: best total for words[:j]
+    brk = [0] * (n + 1)       # brk[j]: first word of the line ending at j
+    for j in range(1, n + 1):
+        i, width = j - 1, len(words[j - 1])
+        while True:
+            slack = max(0, cols - width)  # an over-long word sits alone at no cost
+            c = cost[i] + slack * slack
+            if c < cost[j]:
+                cost[j], brk[j] = c, i
+            if i == 0:
+                break
+            width += len(gaps[i]) + len(words[i - 1])
+            if width > cols:
+                break
+            i -= 1
+
+    lines: list[str] = []
+    j = n
+    while j > 0:
+        i = brk[j]
+        lines.append(words[i] + "".join(gaps[k] + words[k] for k in range(i + 1, j)))
+        j = i
+    lines.reverse()
+    return lines
+
+@lru_cache(maxsize=256)  # bylines, footers and reprinted quotes repeat
+def _wrap_cached(text: str, cols: int, optimal: bool) -> tuple[str, ...]:
     lines: list[str] = []
     paras = text.splitlines() if "\n" in text else [text]
     for para in paras:
-        words = re.findall(r"\S+|\s+", para)
+        if para and len(para) <= cols and not para[0].isspace() and not para[-1].isspace():
+            lines += [para, ""]  # fits as-is; both wrappers would return it unchanged
+            continue
+        if optimal:
+            lines += _balanced_lines(para, cols)
+            lines.append("")
+            continue
         cur = ""
-        for w in words:
+        for m in _TOKEN_RE.finditer(para):
+            w = m.group()
             if w.isspace():
                 if len(cur) + len(w) <= cols: cur += w
                 else: lines.append(cur.rstrip()); cur = ""
@@ -93,46 +207,71 @@ def wrap_text(text: str, cols: int) -> list[str]:
         if cur: lines.append(cur.rstrip())
         lines.append("")
     if lines and lines[-1] == "": lines.pop()
-    return lines
+    return tuple(lines)
 
-def date_line() -> str:
-    tm = time.localtime()
+_LEADING_ZERO_RE = re.compile(r"\b0(\d)\b")
+
+def date_line(tm: time.struct_time | None = None) -> str:
+    tm = tm or time.localtime()
     try:
         return time.strftime("%a %b %-d %Y %-I:%M %p", tm)
     except Exception:
         s = time.strftime("%a %b %d %Y %I:%M %p", tm)
-        return re.sub(r"\b0(\d)\b", r"\1", s)  # drop leading zeros
+        return _LEADING_ZERO_RE.sub(r"\1", s)  # drop leading zeros
 
 def encode_escpos(text: str) -> bytes:
-    return sanitize_text(text).encode("cp437", errors="replace")
+    # CP437's lower half is ASCII, so one ascii encode (leftovers -> "?") is the CP437 bytes
+    return _fold_text(text).encode("ascii", errors="replace")
 
 # ---------- Quotes (rotation without repeats) ----------
 def _ensure_quotes_dir():
     QUOTES_DIR.mkdir(parents=True, exist_ok=True)
 
+_QUOTES_CACHE: tuple[int, list[dict]] | None = None  # (quotes.tsv st_mtime_ns, parsed quotes)
+# csv caps fields at 128 KiB by default; a quote row has no natural limit
+csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+
 def _load_quotes_tsv() -> list[dict]:
     """
     Read quotes.tsv as: text<TAB>author<TAB>source?
     Returns [{"text": str, "author": str|None, "source": str|None}, ...]
+    The parsed list is reused until the file's mtime changes.
     """
+    global _QUOTES_CACHE
     _ensure_quotes_dir()
+    try:
+        mtime = os.stat(QUOTES_PATH).st_mtime_ns
+    except OSError:
+        return []
+    if _QUOTES_CACHE and _QUOTES_CACHE[0] == mtime:
+        return _QUOTES_CACHE[1]
     quotes = []
     try:
-        with open(QUOTES_PATH, "r", encoding="utf-8") as f:
-            for ln in f:
-                ln = ln.strip()
-                if not ln or ln.lstrip().startswith("#"):  # skip blanks/comments
+        with open(QUOTES_PATH, "r", encoding="utf-8", newline="") as f:
+            # C tokenizer; QUOTE_NONE keeps literal quotes like "Tobacco Shop" intact
+            for parts in csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                if not parts or parts[0].lstrip().startswith("#"):  # skip blanks/comments
                     continue
-                parts = ln.split("\t")
-                text   = parts[0].strip() if len(parts) > 0 else ""
+                text   = parts[0].strip()
                 author = parts[1].strip() if len(parts) > 1 and parts[1].strip() else None
                 source = parts[2].strip() if len(parts) > 2 and parts[2].strip() else None
                 if text:
                     quotes.append({"text": text, "author": author, "source": source})
     except FileNotFoundError:
-        pass
+        return []
+    except csv.Error as e:  # malformed file: print the receipt without a quote
+        print(f"[quotes] ERROR: {QUOTES_PATH}: {e}", flush=True)
+        return []
+    _QUOTES_CACHE = (mtime, quotes)
     return quotes
 
+# Rotation state lives in memory; disk writes are debounced so a burst of
+# quoted prints costs one write.
+_STATE_CACHE: dict | None = None
+_STATE_LOCK = threading.Lock()
+_STATE_TIMER: threading.Timer | None = None
+STATE_FLUSH_DELAY = 1.0  # seconds
+
 def _load_state() -> dict:
     try:
         with open(STATE_PATH, "r", encoding="utf-8") as f:
@@ -143,68 +282,236 @@ def _load_state() -> dict:
 def _save_state(state: dict):
     try:
         with open(STATE_PATH, "w", encoding="utf-8") as f:
-            json.dump(state, f)
+            f.write(json.dumps(state))
     except Exception:
         pass
 
+def _flush_state():
+    with _STATE_LOCK:
+        if _STATE_CACHE is not None:
+            _save_state(_STATE_CACHE)
+
+def _schedule_state_save():
+    """Call with _STATE_LOCK held. Non-daemon timer, so a pending save still runs at exit."""
+    global _STATE_TIMER
+    if _STATE_TIMER is not None:
+        _STATE_TIMER.cancel()
+    _STATE_TIMER = threading.Timer(STATE_FLUSH_DELAY, _flush_state)
+    _STATE_TIMER.start()
+
 def _next_quote() -> dict | None:
     """
     Persistent shuffled rotation. No repeats until the cycle ends.
     Reshuffles automatically if the quotes file changes length.
     """
+    global _STATE_CACHE
     quotes = _load_quotes_tsv()
     if not quotes:
         return None
 
-    state = _load_state()
-    if "order" not in state or "idx" not in state or state.get("n") != len(quotes):
-        order = list(range(len(quotes)))
-        random.shuffle(order)
-        state = {"order": order, "idx": 0, "n": len(quotes)}
-        _save_state(state)
-
-    order = state["order"]; idx = state["idx"]; n = state["n"]
-    if idx >= n:
-        order = list(range(n))
-        random.shuffle(order)
-        idx = 0
-    sel = quotes[order[idx]]
-    state.update({"order": order, "idx": idx + 1})
-    _save_state(state)
+    with _STATE_LOCK:
+        if _STATE_CACHE is None:
+            _STATE_CACHE = _load_state()
+        state = _STATE_CACHE
+        if "order" not in state or "idx" not in state or state.get("n") != len(quotes):
+            order = list(range(len(quotes)))
+            random.shuffle(order)
+            state.clear()
+            state.update({"order": order, "idx": 0, "n": len(quotes)})
+
+        order = state["order"]; idx = state["idx"]; n = state["n"]
+        if idx >= n:
+            order = list(range(n))
+            random.shuffle(order)
+            idx = 0
+        sel = quotes[order[idx]]
+        state.update({"order": order, "idx": idx + 1})
+        _schedule_state_save()
     return sel
 
 # ---------- I/O ----------
-def _write_raw(payload: bytes, device: str, simulate: bool):
+# A single worker thread owns the printer device (opened once per process)
+# and writes queued jobs in order; callers enqueue and wait on a Future.
+_DEV_FD: int | None = None
+_DEV_PATH: str | None = None
+_STALE_DEV_ERRNOS = (errno.ENODEV, errno.ENXIO)  # fd outlived an unplug / power cycle
+_PRINT_Q: queue.Queue[tuple[bytes, str, Future]] = queue.Queue()
+_WORKER: threading.Thread | None = None
+_WORKER_LOCK = threading.Lock()
+
+def _close_device():
+    global _DEV_FD, _DEV_PATH
+    if _DEV_FD is not None:
+        try:
+            os.close(_DEV_FD)
+        except OSError:
+            pass
+    _DEV_FD = _DEV_PATH = None
+
+atexit.register(_close_device)
+
+def _device_fd(device: str) -> int:
+    global _DEV_FD, _DEV_PATH
+    if _DEV_FD is None or _DEV_PATH != device:
+        _close_device()
+        _DEV_FD = os.open(device, os.O_WRONLY)
+        _DEV_PATH = device
+    return _DEV_FD
+
+WRITE_CHUNK = 32 * 1024  # bytes handed to a single write(); the slices are zero-copy
+
+def _device_write(payload: bytes, device: str):
+    # raw fd, no Python I/O layers; big raster batches go out in bounded slices,
+    # and lp/USB drivers may accept less than asked when their buffer is full
+    mv = memoryview(payload)
+    retried = False
+    while mv:
+        try:
+            n = os.write(_device_fd(device), mv[:WRITE_CHUNK])
+        except OSError as e:
+            # reopen and retry once, but only before any byte went out: resending
+            # would duplicate output, and a power-cycled printer can't resume mid-command
+            if retried or len(mv) != len(payload) or e.errno not in _STALE_DEV_ERRNOS:
+                raise
+            retried = True
+            _close_device()
+            continue
+        mv = mv[n:]
+
+def _printer_worker():
+    while True:
+        jobs = [_PRINT_Q.get()]
+        while True:  # coalesce whatever else is already waiting into the same write
+            try:
+                jobs.append(_PRINT_Q.get_nowait())
+            except queue.Empty:
+                break
+        for device, group in groupby(jobs, key=lambda job: job[1]):
+            batch = list(group)
+            try:
+                _device_write(b"".join(payload for payload, _, _ in batch), device)
+            except Exception as e:
+                for _, _, fut in batch:
+                    fut.set_exception(e)
+            else:
+                for _, _, fut in batch:
+                    fut.set_result(None)
+        for _ in jobs:
+            _PRINT_Q.task_done()
+
+def _drain_print_queue():
+    if _WORKER is not None:
+        _PRINT_Q.join()  # don't lose jobs queued with wait=False at interpreter exit
+
+atexit.register(_drain_print_queue)  # runs before _close_device (atexit is LIFO)
+
+def _submit_raw(payload: bytes, device: str) -> Future:
+    """Queue a job for the printer worker; the Future resolves once it is written."""
+    global _WORKER
+    with _WORKER_LOCK:
+        if _WORKER is None:
+            _WORKER = threading.Thread(target=_printer_worker, name="printer-worker", daemon=True)
+            _WORKER.start()
+    fut: Future = Future()
+    _PRINT_Q.put((payload, device, fut))
+    return fut
+
+def _report_write_error(fut: Future):
+    if fut.exception() is not None:
+        print(f"[printer-worker] ERROR: {fut.exception()}", flush=True)
+
+_SESSION = threading.local()  # .jobs: list of (device, payload) while a PrinterSession is open
+
+class PrinterSession:
+    """
+    Collect the jobs of several print_* calls on this thread and send them as one write:
+
+        with PrinterSession():
+            print_todo(...)
+            print_note(...)
+
+    Jobs are written on exit, even if the block raised. Nested sessions join the outer one.
+    """
+    def __enter__(self):
+        self._outer = getattr(_SESSION, "jobs", None) is not None
+        if not self._outer:
+            _SESSION.jobs = []
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._outer:
+            return False
+        jobs, _SESSION.jobs = _SESSION.jobs, None
+        for device, group in groupby(jobs, key=lambda job: job[0]):
+            _submit_raw(b"".join(payload for _, payload in group), device).result()
+        return False
+
+def _write_raw(payload: bytes, device: str, simulate: bool, wait: bool = True):
+    """
+    Hand a job to the printer worker. wait=False returns as soon as it is queued
+    (errors are logged), so the caller can prepare the next job while the device drains.
+    Inside a PrinterSession the job is held until the session closes.
+    """
     if simulate:
         print("[SIMULATE PRINT]", payload[:120], f"...({len(payload)} bytes)", flush=True)
         return
-    with open(device, "wb", buffering=0) as f:
-        f.write(payload)
+    jobs = getattr(_SESSION, "jobs", None)
+    if jobs is not None:
+        jobs.append((device, payload))
+        return
+    fut = _submit_raw(payload, device)
+    if wait:
+        fut.result()
+    else:
+        fut.add_done_callback(_report_write_error)
 
 # ---------- Layout blocks ----------
+@lru_cache(maxsize=32)
+def _header_title_bytes(title: str | None) -> bytes:
+    """Date-independent part of a header: init, centering, big bold title."""
+    if not title:
+        return CENTER_INIT
+    return CENTER_INIT + BOLD_ON + SIZE_DOUBLE + encode_escpos(title) + BOLD_OFF + SIZE_NORMAL + b"\n"
+
+_DATE_CACHE: tuple[tuple, bytes] | None = None  # (localtime()[:5], bold date row)
+
+def _date_bytes() -> bytes:
+    """Bold date_line() row, formatted from a single localtime() read once per minute."""
+    global _DATE_CACHE
+    tm = time.localtime()
+    if _DATE_CACHE and _DATE_CACHE[0] == tm[:5]:
+        return _DATE_CACHE[1]
+    row = BOLD_ON + encode_escpos(date_line(tm)) + BOLD_OFF + b"\n"
+    _DATE_CACHE = (tm[:5], row)
+    return row
+
 def _header_block(title: str | None = None, show_date: bool = True) -> bytes:
     """
     Big bold title (double size), then smaller bold date underneath.
     """
-    chunks: list[bytes] = [INIT, set_codepage_cp437(), ALIGN_CENTER]
-    if title:
-        chunks += [BOLD_ON, char_size(2,2), encode_escpos(title), BOLD_OFF, char_size(1,1), b"\n"]
+    out = _header_title_bytes(title)
     if show_date:
-        chunks += [BOLD_ON, encode_escpos(date_line()), BOLD_OFF, b"\n"]
-    chunks += [b"\n", ALIGN_LEFT]
-    return b"".join(chunks)
+        out += _date_bytes()
+    return out + b"\n" + ALIGN_LEFT
 
 def _body_block(text: str, cols: int) -> bytes:
-    return b"".join(encode_escpos(line) + b"\n" for line in wrap_text(text, cols))
-
-def _quote_block(enabled: bool, footer_text: str = None) -> bytes:
-    if not enabled:
+    if text and len(text) <= cols and "\n" not in text and text == text.strip():
+        return encode_escpos(text) + b"\n"  # already one line; wrap_text would return it as-is
+    lines = wrap_text(text, cols, optimal=True)
+    if not lines:
         return b""
+    return encode_escpos("\n".join(lines) + "\n")  # one sanitize+encode for the whole body
+
+@lru_cache(maxsize=8)
+def _quote_rule_bytes(cols: int) -> bytes:
+    """Blank lines and the dashed rule that open every quote block."""
+    return encode_escpos("\n\n" + ("- " * (cols // 2)).rstrip() + "\n\n")
+
+def _quote_block(cfg: dict) -> bytes:
     q = _next_quote()
     if not q:
         return b""
-    cfg = load_config()
-    cols = int(cfg.get("cols", 42))
+    cols = cfg["cols"]
 
     text = f"\"{q['text']}\""
     by = []
@@ -214,26 +521,32 @@ def _quote_block(enabled: bool, footer_text: str = None) -> bytes:
         by.append(q["source"])
     byline = (" — " + ", ".join(by)) if by else ""
 
-    separator = ("- " * (cols // 2)).rstrip()
-
     wrapped = wrap_text(text, cols)
     if byline:
         wrapped += [""] + wrap_text(byline, cols)
 
-    output_lines = ["", "", separator, ""] + wrapped
-    result = b"".join(encode_escpos(line) + b"\n" for line in output_lines)
-    return result
+    return _quote_rule_bytes(cols) + encode_escpos("".join(line + "\n" for line in wrapped))
 
-def _finalize() -> bytes:
-    return b"\n\n" + CUT_PARTIAL
+def _footer_chunks(include_quote: bool, footer_text: str | None, cfg: dict) -> list[bytes]:
+    """Quote block plus optional separator/footer, gated once on the form flag or config."""
+    if not (include_quote or cfg["quote_footer_enabled"]):
+        return []
+    chunks = [_quote_block(cfg)]
+    if footer_text:
+        chunks.append(separator_and_footer_bytes(footer_text, cfg))
+    return chunks
 
-def _print_payload(chunks: Iterable[bytes]):
-    cfg = load_config()
+def _print_payload(chunks: Iterable[bytes], cfg: dict):
     dev = cfg["printer_device"]
-    simulate = cfg.get("test_mode", False)  # map your key
+    simulate = cfg["test_mode"]  # map your key
     _write_raw(b"".join(chunks), dev, simulate)
 
 # ---------- Weather (OpenWeatherMap) ----------
+_HTTP = requests.Session()              # keep-alive: reuse the TLS connection
+_HTTP.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2))
+WEATHER_CACHE_TTL = 600                 # seconds; OWM data updates ~every 10 min
+_WX_CACHE: dict[tuple[str, str], tuple[float, dict]] = {}  # (location, units) -> (fetched_at, json)
+
 def _looks_like_coords(loc: str) -> bool:
     """Return True if string looks like 'lat,lon' numbers."""
     try:
@@ -244,8 +557,8 @@ def _looks_like_coords(loc: str) -> bool:
     except Exception:
         return False
 
-def fetch_weather_json() -> dict:
-    cfg = load_config()
+def fetch_weather_json(cfg: dict | None = None) -> dict:
+    cfg = cfg or load_config()
     key = (cfg.get("weather_api_key") or "").strip()
     loc = (cfg.get("weather_location") or "").strip()
     units = (cfg.get("weather_units") or "imperial").strip()  # "imperial" or "metric"
@@ -255,6 +568,10 @@ def fetch_weather_json() -> dict:
     if not loc:
         raise RuntimeError("weather_location missing")
 
+    hit = _WX_CACHE.get((loc, units))
+    if hit and time.monotonic() - hit[0] < WEATHER_CACHE_TTL:
+        return hit[1]
+
     params = {"appid": key, "units": units}
     if _looks_like_coords(loc):
         lat, lon = [p.strip() for p in loc.split(",", 1)]
@@ -262,18 +579,20 @@ def fetch_weather_json() -> dict:
     else:
         params["q"] = loc
 
-    r = requests.get("https://api.openweathermap.org/data/2.5/weather", params=params, timeout=8)
+    r = _HTTP.get("https://api.openweathermap.org/data/2.5/weather", params=params, timeout=8)
     r.raise_for_status()
-    return r.json()
+    data = r.json()
+    _WX_CACHE[(loc, units)] = (time.monotonic(), data)
+    return data
 
 def print_weather_report():
     cfg = load_config()
-    cols = int(cfg.get("cols", 42))
+    cols = cfg["cols"]
     units = (cfg.get("weather_units") or "imperial").strip()
     deg_label = "deg F" if units == "imperial" else "deg C"
 
     try:
-        j = fetch_weather_json()
+        j = fetch_weather_json(cfg)
         name = j.get("name") or cfg.get("weather_location")
         main = j.get("main", {})
         wx   = (j.get("weather") or [{}])[0]
@@ -303,159 +622,134 @@ def print_weather_report():
     chunks = [
         _header_block("WEATHER", show_date=True),
         _body_block(body, cols),
-        _finalize(),
+        FINALIZE,
     ]
-    _print_payload(chunks)
+    _print_payload(chunks, cfg)
 
 # ---------- Public text APIs ----------
 def print_note(note: str, include_quote: bool, footer_text: str = None):
-    cfg = load_config(); cols = int(cfg.get("cols", 42))
+    cfg = load_config(); cols = cfg["cols"]
     chunks = [
         _header_block("NOTE", show_date=True),
         _body_block(note, cols),
-        _quote_block(include_quote or cfg.get("quote_footer_enabled", False)),
+        *_footer_chunks(include_quote, footer_text, cfg),
+        FINALIZE,
     ]
-    if (include_quote or cfg.get("quote_footer_enabled", False)) and footer_text:
-        chunks.append(separator_and_footer_bytes(footer_text))
-    chunks.append(_finalize())
-    _print_payload(chunks)
+    _print_payload(chunks, cfg)
 
 def print_todo(todo: str, include_quote: bool, footer_text: str = None):
-    cfg = load_config(); cols = int(cfg.get("cols", 42))
+    cfg = load_config(); cols = cfg["cols"]
     body = f"{todo.strip()}" if todo and todo.strip() else ""
     chunks = [
         _header_block("TODO", show_date=True),
         _body_block(body, cols),
-        _quote_block(include_quote or cfg.get("quote_footer_enabled", False)),
+        *_footer_chunks(include_quote, footer_text, cfg),
+        FINALIZE,
     ]
-    if (include_quote or cfg.get("quote_footer_enabled", False)) and footer_text:
-        chunks.append(separator_and_footer_bytes(footer_text))
-    chunks.append(_finalize())
-    _print_payload(chunks)
+    _print_payload(chunks, cfg)
 
 def print_achievement(text: str, include_quote: bool, footer_text: str = None):
-    cfg = load_config(); cols = int(cfg.get("cols", 42))
+    cfg = load_config(); cols = cfg["cols"]
     body = f"* {text.strip()}"
     chunks = [
         _header_block("New Achievement", show_date=True),
         _body_block(body, cols),
-        _quote_block(include_quote or cfg.get("quote_footer_enabled", False)),
+        *_footer_chunks(include_quote, footer_text, cfg),
+        FINALIZE,
     ]
-    if (include_quote or cfg.get("quote_footer_enabled", False)) and footer_text:
-        chunks.append(separator_and_footer_bytes(footer_text))
-    chunks.append(_finalize())
-    _print_payload(chunks)
+    _print_payload(chunks, cfg)
 
-def separator_and_footer_bytes(footer_text: str) -> bytes:
+def separator_and_footer_bytes(footer_text: str, cfg: dict | None = None) -> bytes:
     # Return bytes for separator image and centered footer text
-    return print_image_centered_bytes('./static/images/separator.png') + print_centered_bytes(footer_text)
+    cfg = cfg or load_config()
+    return print_image_centered_bytes('./static/images/separator.png', cfg) + print_centered_bytes(footer_text, cfg)
 
-def print_image_centered_bytes(image_path: str) -> bytes:
-    cfg = load_config()
-    width_px = int(cfg.get("printer_width_px", 384))
+def print_image_centered_bytes(image_path: str, cfg: dict | None = None) -> bytes:
+    cfg = cfg or load_config()
+    width_px = cfg["printer_width_px"]
     max_h = 200  # Separator image should be short
-    chunk = int(cfg.get("raster_chunk_rows", 160))
+    chunk = cfg["raster_chunk_rows"]
     try:
-        from PIL import Image, ImageOps
+        if Image is None:
+            raise RuntimeError("Pillow is not installed")
         img = _to_mono_bitmap(image_path, target_width_px=width_px, max_height_px=max_h)
-        h = img.size[1]
-        chunks: list[bytes] = [INIT, set_codepage_cp437(), ALIGN_CENTER]
-        y = 0
-        while y < h:
-            rows = min(chunk, h - y)
-            chunks.append(_raster_chunk_cmd(img, y, rows))
-            y += rows
-        chunks += [ALIGN_LEFT, b"\n"]
-        return b"".join(chunks)
+        buf = bytearray(CENTER_INIT)
+        _raster_bands(img, chunk, buf)
+        buf += ALIGN_LEFT + feed_lines(2)
+        return bytes(buf)
     except Exception as e:
         print(f"[print_image_centered_bytes] ERROR: {e}", flush=True)
         return b""
 
-def print_centered_bytes(text: str) -> bytes:
-    cfg = load_config()
-    cols = int(cfg.get("cols", 42))
+def print_centered_bytes(text: str, cfg: dict | None = None) -> bytes:
+    cfg = cfg or load_config()
+    cols = cfg["cols"]
     # Use wrap_text to wrap and center each line
     lines = wrap_text(text, cols)
     centered_lines = []
     for line in lines:
         pad = max(0, (cols - len(line)) // 2)
         centered_lines.append(" " * pad + line)
-    payload = b"".join(encode_escpos(line) + b"\n" for line in centered_lines) + b"\n"
-    return INIT + set_codepage_cp437() + ALIGN_CENTER + payload + ALIGN_LEFT
+    payload = encode_escpos("".join(line + "\n" for line in centered_lines) + "\n")
+    return CENTER_INIT + payload + ALIGN_LEFT
 
 # ---------- Image printing (ESC/POS raster, chunked) ----------
 def _to_mono_bitmap(path: str, target_width_px: int, max_height_px: int) -> "Image.Image":
-    """Open, EXIF-rotate, scale to width, cap height, dither to 1-bit."""
-    from PIL import Image, ImageOps
+    """Open, EXIF-rotate, grayscale, scale to width (capping height) in one resize, dither to 1-bit."""
     img = Image.open(path)
+    # JPEG only: decode straight to grayscale at 1/2..1/8 scale (DCT scaling) while
+    # keeping >= 2x the paper width on both sides, so rotation can't undercut it
+    img.draft("L", (target_width_px * 2, target_width_px * 2))
     img = ImageOps.exif_transpose(img)
+    img = img.convert("L")  # 1 byte/px before the resize instead of 3-4
     w0, h0 = img.size
-    scale = target_width_px / float(w0)
     new_w = target_width_px
-    new_h = max(1, int(round(h0 * scale)))
-    img = img.resize((new_w, new_h))
+    new_h = max(1, int(round(h0 * target_width_px / float(w0))))
     if max_height_px and new_h > max_height_px:
-        scale2 = max_height_px / float(new_h)
-        new_w2 = max(1, int(round(new_w * scale2)))
-        new_h2 = max_height_px
-        img = img.resize((new_w2, new_h2))
-        new_w, new_h = img.size
-        if new_w < target_width_px:
-            canvas = Image.new("L", (target_width_px, new_h), 255)
-            canvas.paste(img, ((target_width_px - new_w)//2, 0))
-            img = canvas
-    return img.convert("1")  # 1-bit dither
-
-def _pack_bits_row(img, y: int) -> bytes:
-    w, _ = img.size
-    out = bytearray()
-    byte = 0; bitpos = 7
-    for x in range(w):
-        if img.getpixel((x, y)) == 0:
-            byte |= (1 << bitpos)  # black dot on
-        bitpos -= 1
-        if bitpos < 0:
-            out.append(byte); byte = 0; bitpos = 7
-    if bitpos != 7:
-        out.append(byte)
-    return bytes(out)
-
-def _raster_chunk_cmd(img, y_start: int, rows: int) -> bytes:
-    """GS v 0 m xL xH yL yH + data for a band of rows (m=0)."""
+        new_w = max(1, int(round(w0 * max_height_px / float(h0))))
+        new_h = max_height_px
+    # reducing_gap: cheap integer box-reduce first, LANCZOS only over the last <=3x
+    img = img.resize((new_w, new_h), Image.LANCZOS, reducing_gap=3.0)
+    if new_w < target_width_px:
+        canvas = Image.new("L", (target_width_px, new_h), 255)
+        canvas.paste(img, ((target_width_px - new_w)//2, 0))
+        img = canvas
+    return img.convert("1", dither=Image.FLOYDSTEINBERG)  # 1-bit dither
+
+def _raster_bands(img, chunk_rows: int, out: bytearray) -> None:
+    """Append GS v 0 m xL xH yL yH + data for each band of chunk_rows rows of a 1-bit image (m=0)."""
     w, h = img.size
-    rows = min(rows, h - y_start)
     row_bytes = (w + 7) // 8
+    # Pillow's "1;I" packer already emits the raster layout: MSB first, 1 = black dot
+    raw = memoryview(img.tobytes("raw", "1;I"))
+    assert len(raw) == row_bytes * h, "packed size must match the yL/yH heights"
     xL, xH = row_bytes & 0xFF, (row_bytes >> 8) & 0xFF
-    yL, yH = rows & 0xFF, (rows >> 8) & 0xFF
-    header = GS + b"v0" + b"\x00" + bytes([xL, xH, yL, yH])
-    body = bytearray()
-    for y in range(y_start, y_start + rows):
-        body += _pack_bits_row(img, y)
-    return header + bytes(body) + b"\n"  # LF after chunk helps some models
+    step = max(1, chunk_rows)
+    for y in range(0, h, step):
+        rows = min(step, h - y)
+        out += GS + b"v0" + b"\x00" + bytes([xL, xH, rows & 0xFF, (rows >> 8) & 0xFF])
+        out += raw[y * row_bytes:(y + rows) * row_bytes]
+    # no LF between bands (it feeds a blank line mid-image); callers feed with ESC d after the last one
 
 def print_image(path: str):
     cfg = load_config()
+    if cfg["test_mode"]:
+        # the preview would only show the first few raster bytes; skip decode/dither/pack
+        print("[SIMULATE PRINT] image", path, flush=True)
+        return
+    if Image is None:
+        print("[print_image] ERROR: Pillow is not installed", flush=True)
+        return
     dev     = cfg["printer_device"]
-    simulate= cfg.get("test_mode", False)
-    width_px= int(cfg.get("printer_width_px", 384))
-    max_h   = int(cfg.get("max_image_height_px", 4096))
-    chunk   = int(cfg.get("raster_chunk_rows", 160))
+    width_px= cfg["printer_width_px"]
+    max_h   = cfg["max_image_height_px"]
+    chunk   = cfg["raster_chunk_rows"]
     try:
         img = _to_mono_bitmap(path, target_width_px=width_px, max_height_px=max_h)
-        h = img.size[1]
-        chunks: list[bytes] = [INIT, set_codepage_cp437(), ALIGN_CENTER]
-        y = 0
-        while y < h:
-            rows = min(chunk, h - y)
-            chunks.append(_raster_chunk_cmd(img, y, rows))
-            y += rows
-        chunks += [ALIGN_LEFT, b"\n\n", CUT_PARTIAL]
-        _write_raw(b"".join(chunks), dev, simulate)
-    except Exception as e:
-        print(f"[print_image] ERROR: {e}", flush=True)
-        _write_raw(b"".join(chunks), dev, simulate)
+        payload = bytearray(CENTER_INIT)
+        _raster_bands(img, chunk, payload)
+        payload += ALIGN_LEFT + feed_lines(3) + CUT_PARTIAL
+        # tall rasters take seconds to print; stream them from the worker without blocking
+        _write_raw(bytes(payload), dev, False, wait=False)
     except Exception as e:
         print(f"[print_image] ERROR: {e}", flush=True)
-        print(f"[print_image] ERROR: {e}", flush=True)
-        print(f"[print_image] ERROR: {e}", flush=True)
-        print(f"[print_image] ERROR: {e}", flush=True)